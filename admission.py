@@ -0,0 +1,156 @@
+"""
+Admission control for the prediction endpoint
+
+Kept free of Flask so the limiter can be exercised on its own.
+"""
+
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+LATENCY_WINDOW_SECONDS = 30
+LATENCY_MIN_SAMPLES = 20
+PROBE_INTERVAL_SECONDS = 1.0
+RESULT_CACHE_SIZE = 256
+
+def parse_latency_budget_ms(value, max_budget_ms):
+    """Parse a client-supplied latency budget, clamped to max_budget_ms. Returns None if invalid."""
+    try:
+        budget_ms = float(value)
+    except (TypeError, ValueError):
+        return None
+
+    if not math.isfinite(budget_ms) or budget_ms <= 0:
+        return None
+    return min(budget_ms, max_budget_ms)
+
+class AdmissionController:
+    """Concurrency limiter and load shedder around the ML prediction path"""
+
+    def __init__(self, max_concurrent, max_queued,
+                 latency_window_seconds=LATENCY_WINDOW_SECONDS,
+                 min_samples=LATENCY_MIN_SAMPLES,
+                 probe_interval_seconds=PROBE_INTERVAL_SECONDS,
+                 cache_size=RESULT_CACHE_SIZE):
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.latency_window_seconds = latency_window_seconds
+        self.min_samples = min_samples
+        self.probe_interval_seconds = probe_interval_seconds
+        self.cache_size = cache_size
+
+        self._semaphore = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._last_probe = 0.0
+        self._probe_budget_ms = None
+
+        # (timestamp, latency_ms) of recent model calls for the p99 estimate
+        self._latencies = deque(maxlen=1000)
+
+        # Last good model answers, served when the request is degraded
+        self._results = OrderedDict()
+
+        # 'shed' counts every request turned away; 'timed_out' is the subset that waited for a slot
+        self.counters = {'admitted': 0, 'probes': 0, 'shed': 0, 'timed_out': 0, 'degraded': 0}
+
+    def _p99_locked(self):
+        """p99 latency over the recent window, or None with too few samples"""
+        cutoff = time.monotonic() - self.latency_window_seconds
+        while self._latencies and self._latencies[0][0] < cutoff:
+            self._latencies.popleft()
+
+        if len(self._latencies) < self.min_samples:
+            return None
+
+        ordered = sorted(latency for _, latency in self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(0.99 * len(ordered)) - 1)]
+
+    def acquire(self, budget_ms):
+        """
+        Try to get a prediction slot within the budget.
+
+        Returns (admitted, reason): reason says why a request was shed, or is
+        'probe' for a request let through while the p99 is over budget.
+        """
+        with self._lock:
+            if self._waiting >= self.max_queued:
+                self.counters['shed'] += 1
+                return False, 'queue_full'
+
+            p99 = self._p99_locked()
+            if p99 is not None and p99 > budget_ms:
+                # Let an occasional probe through so the p99 estimate can recover
+                now = time.monotonic()
+                if now - self._last_probe < self.probe_interval_seconds:
+                    self.counters['shed'] += 1
+                    return False, 'latency_over_budget'
+                self._last_probe = now
+                self._probe_budget_ms = budget_ms
+                self.counters['probes'] += 1
+                probe = True
+            else:
+                probe = False
+
+            self._waiting += 1
+
+        try:
+            acquired = self._semaphore.acquire(timeout=budget_ms / 1000.0)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        with self._lock:
+            if not acquired:
+                self.counters['shed'] += 1
+                self.counters['timed_out'] += 1
+                return False, 'queue_timeout'
+            self._in_flight += 1
+            self.counters['admitted'] += 1
+
+        return True, 'probe' if probe else None
+
+    def release(self, started_at, probe=False):
+        """Free the slot and record how long the model call took"""
+        finished_at = time.monotonic()
+        latency_ms = (finished_at - started_at) * 1000.0
+        with self._lock:
+            self._in_flight -= 1
+            # A probe that met its budget shows the slow samples are stale
+            if probe and self._probe_budget_ms is not None and latency_ms <= self._probe_budget_ms:
+                self._latencies.clear()
+            self._latencies.append((finished_at, latency_ms))
+        self._semaphore.release()
+
+    def remember(self, locality, cuisine, result):
+        """Cache a successful model answer for later degraded responses"""
+        key = (locality.lower(), cuisine.lower())
+        with self._lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+
+    def cached(self, locality, cuisine):
+        """Return the cached model answer for this query, if any"""
+        with self._lock:
+            return self._results.get((locality.lower(), cuisine.lower()))
+
+    def record_degraded(self):
+        with self._lock:
+            self.counters['degraded'] += 1
+
+    def stats(self):
+        """Snapshot of limiter state and counters for the health endpoint"""
+        with self._lock:
+            p99 = self._p99_locked()
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_queued': self.max_queued,
+                'in_flight': self._in_flight,
+                'waiting': self._waiting,
+                'p99_latency_ms': round(p99, 1) if p99 is not None else None,
+                'counters': dict(self.counters)
+            }
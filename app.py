@@ -1,6 +1,11 @@
 from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
 import logging
+import os
+import time
+
+from admission import AdmissionController, parse_latency_budget_ms
+from fallback import FALLBACK_CUISINE_RATINGS
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -20,15 +25,18 @@ except Exception as e:
     logger.error(f"❌ Failed to load ML model: {e}")
     logger.info("🔄 Server will use fallback predictions")
 
+# Admission control settings (overridable through the environment)
+DEFAULT_LATENCY_BUDGET_MS = float(os.environ.get('PREDICT_LATENCY_BUDGET_MS', 2000))
+MAX_LATENCY_BUDGET_MS = float(os.environ.get('PREDICT_MAX_LATENCY_BUDGET_MS', 10000))
+MAX_CONCURRENT_PREDICTIONS = int(os.environ.get('MAX_CONCURRENT_PREDICTIONS', 4))
+MAX_QUEUED_PREDICTIONS = int(os.environ.get('MAX_QUEUED_PREDICTIONS', 16))
+LATENCY_BUDGET_HEADER = 'X-Latency-Budget-Ms'
+
+admission = AdmissionController(MAX_CONCURRENT_PREDICTIONS, MAX_QUEUED_PREDICTIONS)
+
 def get_fallback_prediction(locality, cuisine):
     """Fallback prediction when ML model is not available"""
-    cuisine_ratings = {
-        'north indian': 4.2, 'south indian': 4.2, 'chinese': 4.1,
-        'italian': 4.1, 'fast food': 3.8, 'street food': 4.3,
-        'desserts': 4.0, 'cafe': 3.9, 'pizza': 4.0, 'burger': 3.9
-    }
-
-    predicted_rating = cuisine_ratings.get(cuisine.lower(), 4.0)
+    predicted_rating = FALLBACK_CUISINE_RATINGS.get(cuisine.lower(), 4.0)
 
     return {
         'status': 'success',
@@ -54,6 +62,28 @@ def get_fallback_prediction(locality, cuisine):
         'model_used': False
     }
 
+def get_latency_budget_ms():
+    """Per-request latency budget from the request header, else the configured default"""
+    header_value = request.headers.get(LATENCY_BUDGET_HEADER)
+    if header_value:
+        budget_ms = parse_latency_budget_ms(header_value, MAX_LATENCY_BUDGET_MS)
+        if budget_ms is not None:
+            return budget_ms
+        logger.warning(f"⚠️ Ignoring invalid {LATENCY_BUDGET_HEADER} header: {header_value!r}")
+    return DEFAULT_LATENCY_BUDGET_MS
+
+def get_degraded_prediction(locality, cuisine, reason):
+    """Cached or fallback answer used when the request is shed under load"""
+    cached_result = admission.cached(locality, cuisine)
+    if cached_result is not None:
+        prediction_result = dict(cached_result)
+    else:
+        prediction_result = get_fallback_prediction(locality, cuisine)
+
+    prediction_result.update({'model_used': False, 'degraded': True, 'degraded_reason': reason})
+    admission.record_degraded()
+    return prediction_result
+
 @app.route('/')
 def home():
     return render_template('index.html')
@@ -74,13 +104,23 @@ def predict():
         logger.info(f"🔍 Prediction request: {locality} + {cuisine}")
 
         if MODEL_AVAILABLE:
+            admitted, reason = admission.acquire(get_latency_budget_ms())
+            if not admitted:
+                logger.warning(f"⏳ Prediction degraded ({reason})")
+                return jsonify(get_degraded_prediction(locality, cuisine, reason))
+
+            started_at = time.monotonic()
             try:
                 prediction_result = get_prediction(locality, cuisine)
+                if prediction_result.get('status') == 'success' and prediction_result.get('model_used'):
+                    admission.remember(locality, cuisine, prediction_result)
                 logger.info("✅ ML Model prediction successful")
                 return jsonify(prediction_result)
             except Exception as e:
                 logger.error(f"❌ ML Model failed: {e}")
                 logger.info("🔄 Using fallback prediction")
+            finally:
+                admission.release(started_at, probe=reason == 'probe')
 
         prediction_result = get_fallback_prediction(locality, cuisine)
         logger.info("✅ Fallback prediction successful")
@@ -140,7 +180,16 @@ def cuisines_by_locality(locality):
 
 @app.route('/health', methods=['GET'])
 def health():
-    return jsonify({'status': 'healthy', 'model_available': MODEL_AVAILABLE, 'message': 'Server is running'})
+    return jsonify({
+        'status': 'healthy',
+        'model_available': MODEL_AVAILABLE,
+        'admission': dict(
+            admission.stats(),
+            default_budget_ms=DEFAULT_LATENCY_BUDGET_MS,
+            max_budget_ms=MAX_LATENCY_BUDGET_MS
+        ),
+        'message': 'Server is running'
+    })
 
 if __name__ == '__main__':
     logger.info("🚀 Starting Flask server...")
@@ -0,0 +1,20 @@
+"""
+Rule-based fallback data shared by the Flask app and the model
+
+Kept free of ML dependencies so the app can still serve fallback
+predictions when model.py fails to import.
+"""
+
+# Typical ratings per cuisine, used when the ML model is not available
+FALLBACK_CUISINE_RATINGS = {
+    'north indian': 4.2,
+    'south indian': 4.2,
+    'chinese': 4.1,
+    'italian': 4.1,
+    'fast food': 3.8,
+    'street food': 4.3,
+    'desserts': 4.0,
+    'cafe': 3.9,
+    'pizza': 4.0,
+    'burger': 3.9
+}
@@ -1,10 +1,18 @@
+import argparse
+import json
 import pickle
 import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.neighbors import KNeighborsRegressor
 from functools import lru_cache
+from fallback import FALLBACK_CUISINE_RATINGS
 import logging
 
 # Configure logging
@@ -345,14 +353,19 @@ class RestaurantRecommender:
         """Check if cuisine exists with caching."""
         return any(cuisine.lower() in cuis.lower() for cuis in self.cuisines)
 
-    @lru_cache(maxsize=128)
-    def _get_prediction_score(self, locality, cuisine):
-        """Get prediction score with caching."""
-        # Use cached median cost
+    def _get_median_cost(self):
+        """Median cost for two, cached after the first lookup."""
         avg_cost = getattr(self, '_cached_median_cost', None)
         if avg_cost is None:
             avg_cost = self.df['avg_cost_for_two'].median() if self.df is not None else 500
             self._cached_median_cost = avg_cost
+        return avg_cost
+
+    @lru_cache(maxsize=128)
+    def _get_prediction_score(self, locality, cuisine):
+        """Get prediction score with caching."""
+        # Use cached median cost
+        avg_cost = self._get_median_cost()
 
         # Create input efficiently
         input_data = pd.DataFrame({
@@ -375,18 +388,7 @@ class RestaurantRecommender:
         cuisine = cuisine.strip().title()
 
         # Optimized rule-based prediction with better logic
-        cuisine_ratings = {
-            'north indian': 4.2,
-            'south indian': 4.2,
-            'chinese': 4.1,
-            'italian': 4.1,
-            'fast food': 3.8,
-            'street food': 4.3,
-            'desserts': 4.0,
-            'cafe': 3.9
-        }
-
-        predicted_rating = cuisine_ratings.get(cuisine.lower(), 4.0)
+        predicted_rating = FALLBACK_CUISINE_RATINGS.get(cuisine.lower(), 4.0)
 
         # Get fallback restaurants
         restaurants = self.get_fallback_restaurants(locality, cuisine, predicted_rating)
@@ -400,6 +402,72 @@ class RestaurantRecommender:
             'model_used': False
         }
 
+    def predict_batch(self, localities, cuisines, costs=None):
+        """
+        Vectorized rating prediction for many queries at once.
+
+        Args:
+            localities (array-like): Locality names
+            cuisines (array-like): Cuisine types
+            costs (array-like, optional): Cost for two; missing values use the median cost
+
+        Returns:
+            pd.DataFrame: One row per query with status, predicted_rating and model_used
+        """
+        queries = pd.DataFrame({
+            'Locality': pd.Series(np.asarray(localities, dtype=object)).fillna('').astype(str).str.strip().str.title(),
+            'Cuisines': pd.Series(np.asarray(cuisines, dtype=object)).fillna('').astype(str).str.strip().str.title()
+        })
+        if costs is None:
+            queries['avg_cost_for_two'] = np.nan
+        else:
+            queries['avg_cost_for_two'] = pd.to_numeric(pd.Series(np.asarray(costs, dtype=object)), errors='coerce')
+        queries['avg_cost_for_two'] = queries['avg_cost_for_two'].fillna(self._get_median_cost())
+
+        results = pd.DataFrame({
+            'locality': queries['Locality'],
+            'cuisine': queries['Cuisines'],
+            'cost_for_two': queries['avg_cost_for_two'],
+            'status': 'success',
+            'predicted_rating': np.nan,
+            'model_used': False
+        })
+
+        # Blank fields would match every locality/cuisine, so they are never scored
+        valid = ((queries['Locality'] != '') & (queries['Cuisines'] != '')).to_numpy()
+        results.loc[~valid, 'status'] = 'invalid_query'
+
+        if not self.model_loaded or self.model is None or self.encoder is None:
+            results.loc[valid, 'predicted_rating'] = (
+                queries.loc[valid, 'Cuisines'].str.lower().map(FALLBACK_CUISINE_RATINGS).fillna(4.0)
+            )
+            return results
+
+        # Existence checks run once per distinct value
+        locality_ok = queries['Locality'].map(
+            {loc: self._check_locality_exists(loc) for loc in queries['Locality'].unique()}
+        ).to_numpy(dtype=bool)
+        cuisine_ok = queries['Cuisines'].map(
+            {cuis: self._check_cuisine_exists(cuis) for cuis in queries['Cuisines'].unique()}
+        ).to_numpy(dtype=bool)
+
+        results['status'] = np.select(
+            [~valid, ~locality_ok, ~cuisine_ok],
+            ['invalid_query', 'locality_not_found', 'cuisine_not_found'],
+            default='success'
+        )
+        results['model_used'] = True
+
+        known = valid & locality_ok & cuisine_ok
+        if known.any():
+            known_queries = queries[known]
+            categorical_encoded = self.encoder.transform(known_queries[['Locality', 'Cuisines']])
+            X_pred = np.column_stack([categorical_encoded, known_queries['avg_cost_for_two'].to_numpy()])
+            predicted = np.clip(self.model.predict(X_pred), 1.0, 5.0).round(1)
+            results.loc[known, 'predicted_rating'] = predicted
+
+        return results
+
     def get_localities(self):
         """Return the list of available localities"""
         return self.localities
@@ -455,3 +523,213 @@ def get_cuisines():
 def get_cuisines_for_locality(locality):
     """Get cuisines for specific locality."""
     return get_recommender().get_cuisines_for_locality(locality)
+
+# Bulk scoring over large query files
+QUERY_COLUMN_ALIASES = {
+    'locality': ('locality',),
+    'cuisine': ('cuisine', 'cuisines'),
+    'cost': ('cost', 'cost_for_two', 'avg_cost_for_two')
+}
+
+def _resolve_query_columns(chunk):
+    """Map the locality/cuisine/cost columns of an input chunk, case-insensitively."""
+    lowered = {str(col).strip().lower(): col for col in chunk.columns}
+    resolved = {}
+    for field, aliases in QUERY_COLUMN_ALIASES.items():
+        resolved[field] = next((lowered[alias] for alias in aliases if alias in lowered), None)
+
+    if resolved['locality'] is None or resolved['cuisine'] is None:
+        raise ValueError(f"Input must have locality and cuisine columns, got: {chunk.columns.tolist()}")
+    return resolved
+
+def _score_chunk(chunk):
+    """Score one chunk of queries (runs inside a worker process)."""
+    if chunk.empty:
+        return pd.DataFrame()
+    columns = _resolve_query_columns(chunk)
+    costs = chunk[columns['cost']] if columns['cost'] is not None else None
+    return get_recommender().predict_batch(chunk[columns['locality']], chunk[columns['cuisine']], costs)
+
+def _init_scoring_worker():
+    """Load the recommender once per worker process."""
+    get_recommender()
+
+def _iter_query_chunks(input_path, chunk_size, skip_rows=0, encoding='utf-8'):
+    """Yield (rows_read, DataFrame) chunks from a CSV or JSONL file, starting after skip_rows."""
+    if input_path.lower().endswith(('.jsonl', '.ndjson')):
+        with open(input_path, 'r', encoding=encoding) as f:
+            lines = islice(f, skip_rows, None)
+            while True:
+                batch = list(islice(lines, chunk_size))
+                if not batch:
+                    break
+                records = [json.loads(line) for line in batch if line.strip()]
+                yield len(batch), pd.DataFrame.from_records(records)
+    else:
+        # Skip parsed rows rather than file lines: pandas drops blank lines,
+        # and a list-like skiprows would be materialized as a set in memory
+        reader = pd.read_csv(input_path, chunksize=chunk_size, encoding=encoding)
+        for chunk in reader:
+            if skip_rows >= len(chunk):
+                skip_rows -= len(chunk)
+                continue
+            if skip_rows:
+                chunk = chunk.iloc[skip_rows:]
+                skip_rows = 0
+            yield len(chunk), chunk
+
+def _load_checkpoint(checkpoint_path, input_path, chunk_size):
+    """Read a checkpoint left by an interrupted run, if it matches this job."""
+    if not os.path.exists(checkpoint_path):
+        return None
+
+    with open(checkpoint_path, 'r') as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get('input') != os.path.abspath(input_path) or checkpoint.get('chunk_size') != chunk_size:
+        raise ValueError(f"Checkpoint {checkpoint_path} belongs to a different job; use --restart to discard it")
+    return checkpoint
+
+def _save_checkpoint(checkpoint_path, checkpoint):
+    """Write the checkpoint atomically so an interruption never leaves it half-written."""
+    tmp_path = checkpoint_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, checkpoint_path)
+
+def _write_results(f, results, as_jsonl, write_header):
+    """Append a scored chunk to the output file."""
+    if results.empty:
+        return
+    if as_jsonl:
+        f.write(results.to_json(orient='records', lines=True).rstrip('\n') + '\n')
+    else:
+        results.to_csv(f, header=write_header, index=False)
+
+def score_file(input_path, output_path, chunk_size=10000, workers=None,
+               checkpoint_path=None, restart=False, encoding='utf-8'):
+    """
+    Stream a CSV/JSONL file of (locality, cuisine[, cost]) queries through the model.
+
+    Chunks are scored in a process pool and written to output_path in input order.
+    Progress is checkpointed after every chunk so an interrupted run resumes where it stopped.
+
+    Returns:
+        dict: Rows scored, elapsed seconds and rows/sec for this run
+    """
+    workers = workers or os.cpu_count() or 1
+    checkpoint_path = checkpoint_path or output_path + '.ckpt'
+    as_jsonl = output_path.lower().endswith(('.jsonl', '.ndjson'))
+
+    checkpoint = None if restart else _load_checkpoint(checkpoint_path, input_path, chunk_size)
+    if checkpoint is None:
+        checkpoint = {
+            'input': os.path.abspath(input_path),
+            'chunk_size': chunk_size,
+            'rows_read': 0,
+            'rows_written': 0,
+            'output_bytes': 0
+        }
+    else:
+        logger.info(f"Resuming from checkpoint: {checkpoint['rows_read']} input rows already scored")
+
+    # Drop anything written after the last checkpoint
+    output_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+    if output_size < checkpoint['output_bytes']:
+        raise ValueError(
+            f"Output {output_path} is shorter than checkpoint {checkpoint_path} expects; use --restart to discard it"
+        )
+    with open(output_path, 'ab') as f:
+        f.truncate(checkpoint['output_bytes'])
+
+    # Load (or train) the model once up front so workers reuse the saved pickle
+    get_recommender()
+
+    chunks = _iter_query_chunks(input_path, chunk_size, checkpoint['rows_read'], encoding)
+    rows_scored = 0
+    started_at = time.monotonic()
+
+    with open(output_path, 'a', encoding='utf-8', newline='') as out:
+        def write_chunk(rows_read, results):
+            nonlocal rows_scored
+            _write_results(out, results, as_jsonl, write_header=checkpoint['output_bytes'] == 0)
+            out.flush()
+            os.fsync(out.fileno())
+
+            rows_scored += len(results)
+            checkpoint['rows_read'] += rows_read
+            checkpoint['rows_written'] += len(results)
+            checkpoint['output_bytes'] = out.tell()
+            _save_checkpoint(checkpoint_path, checkpoint)
+
+            elapsed = time.monotonic() - started_at
+            logger.info(f"Scored {checkpoint['rows_written']} rows ({rows_scored / max(elapsed, 1e-9):.0f} rows/sec)")
+
+        if workers == 1:
+            for rows_read, chunk in chunks:
+                write_chunk(rows_read, _score_chunk(chunk))
+        else:
+            # Keep a bounded window of chunks in flight and write them back in order
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_scoring_worker) as pool:
+                pending = deque()
+                for rows_read, chunk in chunks:
+                    pending.append((rows_read, pool.submit(_score_chunk, chunk)))
+                    if len(pending) >= workers * 2:
+                        rows_read, future = pending.popleft()
+                        write_chunk(rows_read, future.result())
+                while pending:
+                    rows_read, future = pending.popleft()
+                    write_chunk(rows_read, future.result())
+
+    elapsed = time.monotonic() - started_at
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    summary = {
+        'rows': rows_scored,
+        'total_rows': checkpoint['rows_written'],
+        'seconds': round(elapsed, 2),
+        'rows_per_sec': round(rows_scored / elapsed, 1) if elapsed > 0 else None
+    }
+    logger.info(f"Bulk scoring finished: {summary}")
+    return summary
+
+def main(argv=None):
+    """Command-line entry point: python model.py score INPUT OUTPUT"""
+    parser = argparse.ArgumentParser(description='Restaurant Recommender offline tools')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score_parser = subparsers.add_parser('score', help='Bulk-score a CSV/JSONL file of queries')
+    score_parser.add_argument('input', help='CSV or JSONL file with locality, cuisine[, cost] columns')
+    score_parser.add_argument('output', help='Output file (.jsonl for JSON lines, CSV otherwise)')
+    score_parser.add_argument('--chunk-size', type=int, default=10000, help='Rows per chunk (default: 10000)')
+    score_parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    score_parser.add_argument('--checkpoint', default=None, help='Checkpoint path (default: OUTPUT.ckpt)')
+    score_parser.add_argument('--restart', action='store_true', help='Ignore any existing checkpoint')
+    score_parser.add_argument('--encoding', default='utf-8', help='Input file encoding (default: utf-8)')
+
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be positive')
+
+    try:
+        summary = score_file(
+            args.input, args.output,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            checkpoint_path=args.checkpoint,
+            restart=args.restart,
+            encoding=args.encoding
+        )
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; rerun the same command to resume from the checkpoint")
+        return 130
+    except Exception as e:
+        logger.error(f"Bulk scoring failed: {e}")
+        return 1
+
+    print(f"Scored {summary['rows']} rows in {summary['seconds']}s ({summary['rows_per_sec']} rows/sec)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
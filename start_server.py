@@ -12,6 +12,8 @@ def check_requirements():
     required_files = [
         'app.py',
         'model.py',
+        'fallback.py',
+        'admission.py',
         'zomato_indore.xlsx'
     ]
     
@@ -0,0 +1,144 @@
+import threading
+import time
+
+import pytest
+
+from admission import AdmissionController, parse_latency_budget_ms
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.005)
+
+
+def record_latencies(controller, latency_ms, count):
+    """Push `count` admitted calls of roughly latency_ms through the controller."""
+    for _ in range(count):
+        admitted, _ = controller.acquire(10000)
+        assert admitted
+        controller.release(time.monotonic() - latency_ms / 1000.0)
+
+
+def test_admits_when_idle():
+    controller = AdmissionController(max_concurrent=2, max_queued=4)
+
+    assert controller.acquire(100) == (True, None)
+    controller.release(time.monotonic())
+
+    stats = controller.stats()
+    assert stats['in_flight'] == 0
+    assert stats['counters']['admitted'] == 1
+    assert stats['counters']['shed'] == 0
+
+
+def test_queue_full_is_shed():
+    controller = AdmissionController(max_concurrent=1, max_queued=1)
+    assert controller.acquire(100) == (True, None)
+
+    waiter_result = []
+    waiter = threading.Thread(target=lambda: waiter_result.append(controller.acquire(2000)))
+    waiter.start()
+    wait_until(lambda: controller.stats()['waiting'] == 1)
+
+    assert controller.acquire(2000) == (False, 'queue_full')
+
+    controller.release(time.monotonic())
+    waiter.join()
+    assert waiter_result == [(True, None)]
+    controller.release(time.monotonic())
+
+    counters = controller.stats()['counters']
+    assert counters['shed'] == 1
+    assert counters['timed_out'] == 0
+
+
+def test_queue_timeout_counts_as_shed():
+    controller = AdmissionController(max_concurrent=1, max_queued=4)
+    assert controller.acquire(100) == (True, None)
+
+    started = time.monotonic()
+    assert controller.acquire(50) == (False, 'queue_timeout')
+    assert time.monotonic() - started >= 0.04
+
+    counters = controller.stats()['counters']
+    assert counters['shed'] == 1
+    assert counters['timed_out'] == 1
+    controller.release(time.monotonic())
+
+
+def test_p99_over_budget_is_shed():
+    controller = AdmissionController(max_concurrent=2, max_queued=4, min_samples=5, probe_interval_seconds=60)
+    record_latencies(controller, 500, 5)
+    assert controller.stats()['p99_latency_ms'] >= 500
+
+    # The first over-budget request goes through as a probe; a slow probe keeps the gate shut
+    assert controller.acquire(100) == (True, 'probe')
+    controller.release(time.monotonic() - 0.5, probe=True)
+    assert controller.acquire(100) == (False, 'latency_over_budget')
+
+    # A budget above the p99 is still admitted
+    assert controller.acquire(1000) == (True, None)
+    controller.release(time.monotonic())
+
+    counters = controller.stats()['counters']
+    assert counters['probes'] == 1
+    assert counters['shed'] == 1
+
+
+def test_fast_probe_reopens_gate():
+    controller = AdmissionController(max_concurrent=2, max_queued=4, min_samples=5, probe_interval_seconds=0.05)
+    record_latencies(controller, 500, 5)
+
+    assert controller.acquire(100) == (True, 'probe')
+    controller.release(time.monotonic() - 0.5, probe=True)
+    assert controller.acquire(100) == (False, 'latency_over_budget')
+
+    time.sleep(0.06)
+    assert controller.acquire(100) == (True, 'probe')
+    controller.release(time.monotonic(), probe=True)
+
+    assert controller.stats()['p99_latency_ms'] is None
+    assert controller.acquire(100) == (True, None)
+    controller.release(time.monotonic())
+    assert controller.stats()['counters']['probes'] == 2
+
+
+def test_old_latencies_age_out():
+    controller = AdmissionController(max_concurrent=2, max_queued=4, min_samples=5,
+                                     latency_window_seconds=0.05, probe_interval_seconds=60)
+    record_latencies(controller, 500, 5)
+    assert controller.stats()['p99_latency_ms'] is not None
+
+    time.sleep(0.1)
+    assert controller.stats()['p99_latency_ms'] is None
+    assert controller.acquire(100) == (True, None)
+    controller.release(time.monotonic())
+
+
+def test_result_cache_is_case_insensitive_and_bounded():
+    controller = AdmissionController(max_concurrent=1, max_queued=1, cache_size=2)
+    controller.remember('Vijay Nagar', 'Chinese', {'predicted_rating': 4.1})
+    controller.remember('Old Palasia', 'Cafe', {'predicted_rating': 3.9})
+    controller.remember('Rau', 'Pizza', {'predicted_rating': 4.0})
+
+    assert controller.cached('vijay nagar', 'chinese') is None
+    assert controller.cached('OLD PALASIA', 'cafe') == {'predicted_rating': 3.9}
+    assert controller.cached('Rau', 'Pizza') == {'predicted_rating': 4.0}
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1500', 1500.0),
+    ('2.5', 2.5),
+    ('1e300', 10000.0),
+    ('inf', None),
+    ('nan', None),
+    ('0', None),
+    ('-5', None),
+    ('soon', None),
+    (None, None),
+])
+def test_parse_latency_budget_ms(value, expected):
+    assert parse_latency_budget_ms(value, max_budget_ms=10000) == expected
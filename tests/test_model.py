@@ -0,0 +1,161 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import model
+
+QUERIES = [
+    ('Vijay Nagar', 'Chinese', 300),
+    ('Old Palasia', 'North Indian', None),
+    ('', 'Chinese', None),
+    ('Vijay Nagar', '', 300),
+    ('Palasia', 'Cafe', 800),
+    ('Nowhere Town', 'Chinese', None),
+    ('Vijay Nagar', 'Martian Food', 500),
+    ('Sapna Sangeeta', 'Fast Food', None),
+    ('Bhawar Kuan', 'Pizza', 400),
+    ('Vijay Nagar', 'Street Food', None),
+]
+
+
+@pytest.fixture(scope='module')
+def recommender():
+    """Shared recommender that never writes a model pickle into the repo."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(model.RestaurantRecommender, '_save_model', lambda self: None)
+        instance = model.RestaurantRecommender()
+        mp.setattr(model, '_recommender_instance', instance)
+        yield instance
+
+
+def write_queries(path, blank_lines=True):
+    """Write QUERIES as CSV or JSONL, with blank lines sprinkled in."""
+    lines = []
+    if path.endswith('.jsonl'):
+        for locality, cuisine, cost in QUERIES:
+            lines.append(json.dumps({'locality': locality, 'cuisine': cuisine, 'cost': cost}))
+    else:
+        lines.append('locality,cuisine,cost')
+        for locality, cuisine, cost in QUERIES:
+            lines.append(f"{locality},{cuisine},{'' if cost is None else cost}")
+
+    if blank_lines:
+        lines.insert(3, '')
+        lines.insert(7, '')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def test_predict_batch_matches_predict(recommender):
+    localities = [q[0] for q in QUERIES if q[0] and q[1]]
+    cuisines = [q[1] for q in QUERIES if q[0] and q[1]]
+
+    batch = recommender.predict_batch(localities, cuisines)
+
+    for (locality, cuisine), (_, row) in zip(zip(localities, cuisines), batch.iterrows()):
+        single = recommender.predict(locality, cuisine)
+        assert row['status'] == single['status']
+        if single['status'] == 'success':
+            assert row['predicted_rating'] == single['predicted_rating']
+        else:
+            assert np.isnan(row['predicted_rating'])
+
+
+def test_predict_batch_marks_blank_queries_invalid(recommender):
+    batch = recommender.predict_batch(['', 'Vijay Nagar', None], ['Chinese', '  ', 'Chinese'], [None, 300, None])
+
+    assert batch['status'].tolist() == ['invalid_query'] * 3
+    assert batch['predicted_rating'].isna().all()
+
+
+def test_predict_batch_fallback_without_model(recommender, monkeypatch):
+    monkeypatch.setattr(recommender, 'model_loaded', False)
+
+    batch = recommender.predict_batch(['Vijay Nagar', 'Vijay Nagar', ''], ['Pizza', 'Martian Food', 'Cafe'])
+
+    assert batch['status'].tolist() == ['success', 'success', 'invalid_query']
+    assert batch['predicted_rating'].tolist()[:2] == [4.0, 4.0]
+    assert not batch['model_used'].any()
+
+
+@pytest.mark.parametrize('extension', ['csv', 'jsonl'])
+def test_score_file_resumes_after_interruption(recommender, tmp_path, monkeypatch, extension):
+    input_path = str(tmp_path / f'queries.{extension}')
+    write_queries(input_path)
+
+    expected_path = str(tmp_path / f'expected.{extension}')
+    model.score_file(input_path, expected_path, chunk_size=3, workers=1)
+
+    # Interrupt while scoring the second chunk, after the first was checkpointed
+    real_score_chunk = model._score_chunk
+    calls = []
+
+    def interrupted_score_chunk(chunk):
+        calls.append(len(chunk))
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return real_score_chunk(chunk)
+
+    output_path = str(tmp_path / f'output.{extension}')
+    monkeypatch.setattr(model, '_score_chunk', interrupted_score_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        model.score_file(input_path, output_path, chunk_size=3, workers=1)
+    monkeypatch.setattr(model, '_score_chunk', real_score_chunk)
+
+    assert os.path.exists(output_path + '.ckpt')
+
+    # Simulate a chunk that was partly written after the last checkpoint
+    with open(output_path, 'a', encoding='utf-8') as f:
+        f.write('partial row that must be discarded')
+
+    model.score_file(input_path, output_path, chunk_size=3, workers=1)
+
+    with open(expected_path, 'rb') as expected, open(output_path, 'rb') as output:
+        assert output.read() == expected.read()
+    assert not os.path.exists(output_path + '.ckpt')
+
+
+def test_score_file_keeps_input_order_across_workers(recommender, tmp_path):
+    input_path = str(tmp_path / 'queries.csv')
+    write_queries(input_path)
+
+    serial_path = str(tmp_path / 'serial.csv')
+    parallel_path = str(tmp_path / 'parallel.csv')
+    model.score_file(input_path, serial_path, chunk_size=2, workers=1)
+    summary = model.score_file(input_path, parallel_path, chunk_size=2, workers=2)
+
+    assert summary['rows'] == len(QUERIES)
+    assert pd.read_csv(parallel_path).equals(pd.read_csv(serial_path))
+
+
+def test_score_file_refuses_resume_with_truncated_output(recommender, tmp_path):
+    input_path = str(tmp_path / 'queries.csv')
+    write_queries(input_path)
+    output_path = str(tmp_path / 'output.csv')
+
+    model._save_checkpoint(output_path + '.ckpt', {
+        'input': os.path.abspath(input_path),
+        'chunk_size': 3,
+        'rows_read': 3,
+        'rows_written': 3,
+        'output_bytes': 100
+    })
+
+    with pytest.raises(ValueError, match='--restart'):
+        model.score_file(input_path, output_path, chunk_size=3, workers=1)
+
+
+def test_score_file_handles_empty_input(recommender, tmp_path):
+    input_path = str(tmp_path / 'empty.jsonl')
+    open(input_path, 'w').close()
+    output_path = str(tmp_path / 'output.jsonl')
+
+    summary = model.score_file(input_path, output_path, chunk_size=3, workers=1)
+
+    assert summary['rows'] == 0
+    assert os.path.getsize(output_path) == 0
+    assert not os.path.exists(output_path + '.ckpt')